@@ -1,7 +1,7 @@
 """
 ATS Analysis Graph Module
 LangGraph workflow for multi-step resume ATS analysis.
-Nodes: parse → retrieve → analyze (formatting, keywords, experience, skills) → report
+Nodes: parse → retrieve → match keywords → analyze (formatting, keywords, experience, skills) → report
 """
 
 import os
@@ -11,6 +11,13 @@ from typing import TypedDict, Annotated
 from langgraph.graph import StateGraph, END
 from langchain_groq import ChatGroq
 from rag_engine import retrieve_relevant_knowledge
+from keyword_matcher import (
+    compute_keyword_facts,
+    format_keyword_facts,
+    format_verb_facts,
+    score_experience_facts,
+    score_keyword_facts,
+)
 
 
 # ─── State Schema ───────────────────────────────────────────────────────────
@@ -21,6 +28,7 @@ class ATSState(TypedDict):
     resume_metadata: dict
     parsed_sections: dict
     ats_knowledge: str
+    keyword_facts: dict
     formatting_score: dict
     keyword_score: dict
     experience_score: dict
@@ -38,6 +46,11 @@ def get_llm():
     )
 
 
+def is_fast_mode() -> bool:
+    """Fast mode skips the LLM for keyword/experience analysis and scores locally computed facts."""
+    return os.getenv("ATS_FAST_MODE", "").lower() in ("1", "true", "yes")
+
+
 def parse_json_response(text: str) -> dict:
     """Extract JSON from LLM response, handling markdown code blocks."""
     # Try to find JSON in code blocks first
@@ -61,6 +74,59 @@ def parse_json_response(text: str) -> dict:
     return {"error": "Failed to parse LLM response", "raw": text[:500]}
 
 
+# ─── Report Normalisation ───────────────────────────────────────────────────
+# LLM output drifts from the requested schema (nulls, bare strings, nested
+# objects); coerce it here so the typed report model never rejects a finished run.
+
+def as_dict(value) -> dict:
+    """Return value if it is a dict, else an empty dict."""
+    return value if isinstance(value, dict) else {}
+
+
+def as_text(value, default: str = "") -> str:
+    """Coerce a scalar, dict or list to display text, using default for empty values."""
+    if value is None or value == "":
+        return default
+    if isinstance(value, dict):
+        return " — ".join(as_text(v) for v in value.values() if v not in (None, ""))
+    if isinstance(value, list):
+        return ", ".join(as_text(v) for v in value if v not in (None, ""))
+    return str(value)
+
+
+def as_text_list(value) -> list:
+    """Coerce a value to a list of non-empty strings."""
+    if isinstance(value, (str, dict)):
+        value = [value]
+    if not isinstance(value, list):
+        return []
+    return [text for text in (as_text(item) for item in value) if text]
+
+
+def as_score(value, default: int = 50) -> int:
+    """Coerce a score to an int clamped to 0-100, using default when it is not numeric."""
+    try:
+        return round(min(max(float(value), 0), 100))
+    except (TypeError, ValueError):
+        return default
+
+
+def as_improvements(value) -> list:
+    """Coerce top improvements to dicts with string fields, dropping unusable items."""
+    improvements = []
+    for item in value if isinstance(value, list) else []:
+        if isinstance(item, str) and item.strip():
+            improvements.append({"priority": "medium", "category": "", "title": item, "description": ""})
+        elif isinstance(item, dict):
+            improvements.append({
+                "priority": as_text(item.get("priority"), "medium"),
+                "category": as_text(item.get("category")),
+                "title": as_text(item.get("title")),
+                "description": as_text(item.get("description")),
+            })
+    return improvements
+
+
 # ─── Node Functions ─────────────────────────────────────────────────────────
 
 def parse_resume(state: ATSState) -> dict:
@@ -105,8 +171,18 @@ def retrieve_ats_knowledge(state: ATSState) -> dict:
     return {"ats_knowledge": knowledge}
 
 
+def match_keywords(state: ATSState) -> dict:
+    """Node 3: Compute exact keyword and action-verb facts with the local matcher."""
+    parsed = state.get("parsed_sections", {})
+    facts = compute_keyword_facts(
+        state["resume_text"], str(parsed.get("detected_job_field", ""))
+    )
+
+    return {"keyword_facts": facts}
+
+
 def analyze_formatting(state: ATSState) -> dict:
-    """Node 3: Analyze resume formatting and structure."""
+    """Node 4: Analyze resume formatting and structure."""
     llm = get_llm()
     knowledge = state.get("ats_knowledge", "")
     parsed = state.get("parsed_sections", {})
@@ -157,7 +233,11 @@ Return a JSON object:
 
 
 def analyze_keywords(state: ATSState) -> dict:
-    """Node 4: Analyze keyword optimization."""
+    """Node 5: Analyze keyword optimization."""
+    facts = state.get("keyword_facts", {})
+    if is_fast_mode():
+        return {"keyword_score": score_keyword_facts(facts)}
+
     llm = get_llm()
     knowledge = state.get("ats_knowledge", "")
     parsed = state.get("parsed_sections", {})
@@ -178,6 +258,9 @@ Resume Work Experience:
 Professional Summary:
 {parsed.get("professional_summary", "No summary found")}
 
+Locally computed keyword facts (lexicon matches are exact; heuristic counts may need your judgment):
+{format_keyword_facts(facts)}
+
 Return a JSON object:
 {{
     "score": <number 0-100>,
@@ -185,9 +268,7 @@ Return a JSON object:
     "weaknesses": ["keyword optimization issues"],
     "suggestions": ["specific keyword improvements"],
     "details": {{
-        "industry_keywords_found": ["list of relevant industry keywords found"],
-        "missing_common_keywords": ["important keywords that are missing"],
-        "action_verbs_used": ["strong action verbs found"],
+        "missing_common_keywords": ["important keywords that are missing for this candidate's field"],
         "has_quantified_achievements": <bool>,
         "keyword_density_assessment": "low/appropriate/high"
     }}
@@ -195,12 +276,21 @@ Return a JSON object:
 """
     response = llm.invoke(prompt)
     result = parse_json_response(response.content)
+    details = result.get("details")
+    if not isinstance(details, dict):
+        details = {}
+    details.update(facts)
+    result["details"] = details
 
     return {"keyword_score": result}
 
 
 def analyze_experience(state: ATSState) -> dict:
-    """Node 5: Analyze work experience quality."""
+    """Node 6: Analyze work experience quality."""
+    facts = state.get("keyword_facts", {})
+    if is_fast_mode():
+        return {"experience_score": score_experience_facts(facts)}
+
     llm = get_llm()
     parsed = state.get("parsed_sections", {})
 
@@ -212,6 +302,8 @@ Work Experience:
 Estimated Years: {parsed.get("estimated_experience_years", "Unknown")}
 Detected Field: {parsed.get("detected_job_field", "Unknown")}
 
+{format_verb_facts(facts)}
+
 Return a JSON object:
 {{
     "score": <number 0-100>,
@@ -230,12 +322,22 @@ Return a JSON object:
 """
     response = llm.invoke(prompt)
     result = parse_json_response(response.content)
+    details = result.get("details")
+    if not isinstance(details, dict):
+        details = {}
+    # Heuristic counts sit alongside the model's judged booleans, never over them
+    details.update({
+        "action_verbs_used": facts.get("action_verbs_used", []),
+        "action_verb_lines": facts.get("action_verb_lines", 0),
+        "quantified_achievements": facts.get("quantified_achievements", 0),
+    })
+    result["details"] = details
 
     return {"experience_score": result}
 
 
 def analyze_skills(state: ATSState) -> dict:
-    """Node 6: Analyze skills section."""
+    """Node 7: Analyze skills section."""
     llm = get_llm()
     parsed = state.get("parsed_sections", {})
 
@@ -270,20 +372,20 @@ Return a JSON object:
 
 
 def generate_final_report(state: ATSState) -> dict:
-    """Node 7: Generate the final comprehensive ATS report."""
+    """Node 8: Generate the final comprehensive ATS report."""
     llm = get_llm()
 
-    formatting = state.get("formatting_score", {})
-    keywords = state.get("keyword_score", {})
-    experience = state.get("experience_score", {})
-    skills = state.get("skills_score", {})
-    parsed = state.get("parsed_sections", {})
+    formatting = as_dict(state.get("formatting_score"))
+    keywords = as_dict(state.get("keyword_score"))
+    experience = as_dict(state.get("experience_score"))
+    skills = as_dict(state.get("skills_score"))
+    parsed = as_dict(state.get("parsed_sections"))
 
     # Calculate weighted overall score
-    fmt_score = formatting.get("score", 50)
-    kw_score = keywords.get("score", 50)
-    exp_score = experience.get("score", 50)
-    sk_score = skills.get("score", 50)
+    fmt_score = as_score(formatting.get("score"))
+    kw_score = as_score(keywords.get("score"))
+    exp_score = as_score(experience.get("score"))
+    sk_score = as_score(skills.get("score"))
 
     # Weights: Keywords 35%, Experience 25%, Skills 20%, Formatting 20%
     overall_score = round(
@@ -332,7 +434,7 @@ Generate a JSON response with:
 Provide exactly 5-8 improvement items, ordered by priority (high first).
 """
     response = llm.invoke(prompt)
-    summary_data = parse_json_response(response.content)
+    summary_data = as_dict(parse_json_response(response.content))
 
     final_report = {
         "overall_score": overall_score,
@@ -341,44 +443,44 @@ Provide exactly 5-8 improvement items, ordered by priority (high first).
                 "score": fmt_score,
                 "label": "Formatting & Structure",
                 "weight": "20%",
-                "strengths": formatting.get("strengths", []),
-                "weaknesses": formatting.get("weaknesses", []),
-                "suggestions": formatting.get("suggestions", []),
-                "details": formatting.get("details", {}),
+                "strengths": as_text_list(formatting.get("strengths")),
+                "weaknesses": as_text_list(formatting.get("weaknesses")),
+                "suggestions": as_text_list(formatting.get("suggestions")),
+                "details": as_dict(formatting.get("details")),
             },
             "keywords": {
                 "score": kw_score,
                 "label": "Keyword Optimization",
                 "weight": "35%",
-                "strengths": keywords.get("strengths", []),
-                "weaknesses": keywords.get("weaknesses", []),
-                "suggestions": keywords.get("suggestions", []),
-                "details": keywords.get("details", {}),
+                "strengths": as_text_list(keywords.get("strengths")),
+                "weaknesses": as_text_list(keywords.get("weaknesses")),
+                "suggestions": as_text_list(keywords.get("suggestions")),
+                "details": as_dict(keywords.get("details")),
             },
             "experience": {
                 "score": exp_score,
                 "label": "Experience Quality",
                 "weight": "25%",
-                "strengths": experience.get("strengths", []),
-                "weaknesses": experience.get("weaknesses", []),
-                "suggestions": experience.get("suggestions", []),
-                "details": experience.get("details", {}),
+                "strengths": as_text_list(experience.get("strengths")),
+                "weaknesses": as_text_list(experience.get("weaknesses")),
+                "suggestions": as_text_list(experience.get("suggestions")),
+                "details": as_dict(experience.get("details")),
             },
             "skills": {
                 "score": sk_score,
                 "label": "Skills Presentation",
                 "weight": "20%",
-                "strengths": skills.get("strengths", []),
-                "weaknesses": skills.get("weaknesses", []),
-                "suggestions": skills.get("suggestions", []),
-                "details": skills.get("details", {}),
+                "strengths": as_text_list(skills.get("strengths")),
+                "weaknesses": as_text_list(skills.get("weaknesses")),
+                "suggestions": as_text_list(skills.get("suggestions")),
+                "details": as_dict(skills.get("details")),
             },
         },
-        "summary": summary_data.get("summary", "Analysis complete."),
-        "top_improvements": summary_data.get("top_improvements", []),
-        "ats_compatibility": summary_data.get("ats_compatibility", "fair"),
-        "estimated_pass_rate": summary_data.get("estimated_pass_rate", "N/A"),
-        "detected_field": parsed.get("detected_job_field", "Unknown"),
+        "summary": as_text(summary_data.get("summary"), "Analysis complete."),
+        "top_improvements": as_improvements(summary_data.get("top_improvements")),
+        "ats_compatibility": as_text(summary_data.get("ats_compatibility"), "fair"),
+        "estimated_pass_rate": as_text(summary_data.get("estimated_pass_rate"), "N/A"),
+        "detected_field": as_text(parsed.get("detected_job_field"), "Unknown"),
     }
 
     return {"final_report": final_report}
@@ -391,7 +493,7 @@ def build_ats_graph():
     Build and compile the LangGraph for ATS analysis.
     
     Workflow:
-    parse_resume → retrieve_ats_knowledge → [analyze_formatting, analyze_keywords,
+    parse_resume → retrieve_ats_knowledge → match_keywords → [analyze_formatting, analyze_keywords,
     analyze_experience, analyze_skills] → generate_final_report
     """
     workflow = StateGraph(ATSState)
@@ -399,6 +501,7 @@ def build_ats_graph():
     # Add nodes
     workflow.add_node("parse_resume", parse_resume)
     workflow.add_node("retrieve_ats_knowledge", retrieve_ats_knowledge)
+    workflow.add_node("match_keywords", match_keywords)
     workflow.add_node("analyze_formatting", analyze_formatting)
     workflow.add_node("analyze_keywords", analyze_keywords)
     workflow.add_node("analyze_experience", analyze_experience)
@@ -408,7 +511,8 @@ def build_ats_graph():
     # Define edges — sequential flow 
     workflow.set_entry_point("parse_resume")
     workflow.add_edge("parse_resume", "retrieve_ats_knowledge")
-    workflow.add_edge("retrieve_ats_knowledge", "analyze_formatting")
+    workflow.add_edge("retrieve_ats_knowledge", "match_keywords")
+    workflow.add_edge("match_keywords", "analyze_formatting")
     workflow.add_edge("analyze_formatting", "analyze_keywords")
     workflow.add_edge("analyze_keywords", "analyze_experience")
     workflow.add_edge("analyze_experience", "analyze_skills")
@@ -438,6 +542,7 @@ async def analyze_resume(resume_text: str, resume_metadata: dict) -> dict:
         "resume_metadata": resume_metadata,
         "parsed_sections": {},
         "ats_knowledge": "",
+        "keyword_facts": {},
         "formatting_score": {},
         "keyword_score": {},
         "experience_score": {},
@@ -0,0 +1,415 @@
+"""
+Keyword Matcher Module
+Local keyword and action-verb matching against the lexicons in knowledge/keyword_strategies.md.
+Uses a precompiled Aho-Corasick automaton so every fact is computed in one linear pass over the text.
+"""
+
+import re
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+
+KEYWORD_STRATEGIES_FILE = Path(__file__).parent / "knowledge" / "keyword_strategies.md"
+
+INDUSTRY_SECTION = "Industry-Specific Keyword Categories"
+ACTION_VERB_SECTION = "Action Verbs That Score High with ATS"
+
+KEYWORD = "keyword"
+ACTION_VERB = "action_verb"
+
+# Lexicon terms that are also everyday English words only match with their exact casing
+CASE_SENSITIVE_TERMS = frozenset({"Go", "Rust", "Express", "Confluence"})
+
+# Lexicon verbs that are far more often proper nouns on a resume ("United Airlines")
+EXCLUDED_VERBS = frozenset({"united"})
+
+# Numbers that are not achievement metrics: emails/URLs, phone numbers,
+# years, "2019-2021" ranges and "06/2020" dates
+NON_METRIC_PATTERN = re.compile(
+    r"\S+@\S+|https?://\S+|www\.\S+"
+    r"|\+?\d[\d\s().-]{7,}\d"
+    r"|\b(?:\d{1,2}[/.])?(?:19|20)\d{2}\b"
+)
+
+# Field words that name no industry heading but clearly belong to one
+FIELD_ALIASES = {
+    "devel": "Technology / Software Engineering",
+    "data": "Technology / Software Engineering",
+    "web": "Technology / Software Engineering",
+    "stack": "Technology / Software Engineering",
+    "progr": "Technology / Software Engineering",
+    "compu": "Technology / Software Engineering",
+    "cloud": "Technology / Software Engineering",
+    "nurse": "Healthcare",
+    "nursi": "Healthcare",
+    "medic": "Healthcare",
+    "clini": "Healthcare",
+    "accou": "Finance",
+    "bank": "Finance",
+    "inves": "Finance",
+    "brand": "Marketing / Digital",
+    "adver": "Marketing / Digital",
+}
+
+# Field words shared by many roles ("Marketing Manager") only break ties
+GENERIC_FIELD_STEMS = frozenset({"manag"})
+
+
+def _has_metric(line: str) -> bool:
+    """True if a line contains a number other than a date, phone number, email or URL."""
+    return any(ch.isdigit() for ch in NON_METRIC_PATTERN.sub(" ", line))
+
+
+def _stems(value: str) -> list:
+    """Five-letter word stems in order of appearance, so "Financial" and "Finance" compare equal."""
+    return [word[:5] for word in re.findall(r"[a-z]+", (value or "").lower()) if len(word) > 2]
+
+
+# ─── Lexicon Loading ────────────────────────────────────────────────────────
+
+def _split_terms(line: str) -> list:
+    """Split a comma-separated lexicon line into terms, expanding '(ACRONYM)' aliases."""
+    terms = []
+    for term in line.split(","):
+        term = term.strip().rstrip(".")
+        acronym = re.search(r"\(([^)]+)\)", term)
+        if acronym:
+            terms.append(acronym.group(1).strip())
+            term = re.sub(r"\s*\([^)]*\)", "", term).strip()
+        if term:
+            terms.append(term)
+    return terms
+
+
+def load_lexicons(path: Path = KEYWORD_STRATEGIES_FILE) -> tuple:
+    """
+    Parse the per-industry keyword lists and the action-verb lexicon.
+
+    Returns:
+        (industries, action_verbs) where industries maps an industry heading
+        to its keyword list and action_verbs is a flat list of verbs.
+    """
+    industries = {}
+    action_verbs = []
+
+    if not path.exists():
+        return industries, action_verbs
+
+    section = None
+    subsection = None
+    with open(path, "r", encoding="utf-8") as f:
+        for raw_line in f:
+            line = raw_line.strip()
+            if line.startswith("## "):
+                section = line[3:].strip()
+                subsection = None
+            elif line.startswith("### "):
+                subsection = line[4:].strip()
+                if section == INDUSTRY_SECTION:
+                    industries[subsection] = []
+            elif not line or subsection is None:
+                continue
+            elif section == INDUSTRY_SECTION:
+                line = line.lstrip("-* ").strip()
+                # "Label: a, b, c" — the label is a category name, not a keyword
+                if ":" in line:
+                    line = line.split(":", 1)[1]
+                industries[subsection].extend(_split_terms(line))
+            elif section == ACTION_VERB_SECTION:
+                action_verbs.extend(_split_terms(line))
+
+    return industries, action_verbs
+
+
+# ─── Aho-Corasick Automaton ─────────────────────────────────────────────────
+
+class KeywordMatcher:
+    """Multi-pattern matcher built once from the keyword and action-verb lexicons."""
+
+    def __init__(self, industries: dict, action_verbs: list):
+        self.industries = industries
+        self.action_verbs = action_verbs
+
+        # Canonical display form and kind for every lowercase pattern
+        self.patterns = {}
+        for keywords in industries.values():
+            for keyword in keywords:
+                self.patterns.setdefault(keyword.lower(), (KEYWORD, keyword))
+        for verb in action_verbs:
+            if verb.lower() not in EXCLUDED_VERBS:
+                self.patterns.setdefault(verb.lower(), (ACTION_VERB, verb))
+        self._case_sensitive = {
+            pattern for pattern, (_, term) in self.patterns.items() if term in CASE_SENSITIVE_TERMS
+        }
+
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for pattern in self.patterns:
+            self._add_pattern(pattern)
+        self._build_failure_links()
+
+    def _add_pattern(self, pattern: str):
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = nxt
+        self._output[node].append(pattern)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child].extend(self._output[self._fail[child]])
+
+    def scan(self, text: str) -> dict:
+        """
+        Scan text once, collecting pattern hits, word count, lines led by an
+        action verb and quantified lines.
+
+        Action verbs only count when they lead a line or bullet. A line is
+        quantified when it holds a number that is not a date, phone number,
+        email or URL, whatever word starts it.
+
+        Returns:
+            Dictionary with "hits" (pattern -> count), "word_count",
+            "action_lines" and "quantified_achievements".
+        """
+        original = text
+        text = original.lower()
+        if len(text) != len(original):
+            # Keep offsets aligned with the original for case-sensitive terms
+            text = "".join(c.lower() if len(c.lower()) == 1 else c for c in original)
+        hits = {}
+        word_count = 0
+        action_lines = 0
+        quantified = 0
+        line_start = 0
+        line_first_alpha = None
+        line_has_verb = False
+        prev_alnum = False
+        node = 0
+        length = len(text)
+
+        for i, ch in enumerate(text):
+            is_alnum = ch.isalnum()
+            if is_alnum and not prev_alnum:
+                word_count += 1
+            prev_alnum = is_alnum
+            if line_first_alpha is None and ch.isalpha():
+                line_first_alpha = i
+
+            if ch == "\n":
+                action_lines += line_has_verb
+                quantified += _has_metric(text[line_start:i])
+                line_start = i + 1
+                line_first_alpha = None
+                line_has_verb = False
+
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+
+            for pattern in self._output[node]:
+                start = i - len(pattern) + 1
+                # Whole-term matches only: "git" must not fire inside "github"
+                if start > 0 and text[start - 1].isalnum() and pattern[0].isalnum():
+                    continue
+                if i + 1 < length and text[i + 1].isalnum() and pattern[-1].isalnum():
+                    continue
+                kind, term = self.patterns[pattern]
+                if pattern in self._case_sensitive and original[start:i + 1] != term:
+                    continue
+                if kind == ACTION_VERB:
+                    if start != line_first_alpha:
+                        continue
+                    line_has_verb = True
+                hits[pattern] = hits.get(pattern, 0) + 1
+
+        action_lines += line_has_verb
+        quantified += _has_metric(text[line_start:])
+
+        return {
+            "hits": hits,
+            "word_count": word_count,
+            "action_lines": action_lines,
+            "quantified_achievements": quantified,
+        }
+
+    def match_industry(self, field: str) -> str | None:
+        """
+        Pick the lexicon industry for a detected job field.
+
+        Field words are compared by stem with each industry heading and with
+        FIELD_ALIASES. Generic words like "Manager" count for half. Remaining
+        ties go to the industry whose word appears first in the field.
+        Returns None when nothing matches.
+        """
+        field_stems = _stems(field)
+        best, best_rank = None, (0, 0)
+        for industry in self.industries:
+            industry_stems = set(_stems(industry))
+            industry_stems.update(stem for stem, name in FIELD_ALIASES.items() if name == industry)
+            positions = [i for i, stem in enumerate(field_stems) if stem in industry_stems]
+            if not positions:
+                continue
+            weight = sum(0.5 if field_stems[i] in GENERIC_FIELD_STEMS else 1 for i in set(positions))
+            rank = (weight, -positions[0])
+            if rank > best_rank:
+                best, best_rank = industry, rank
+        return best
+
+
+@lru_cache(maxsize=1)
+def get_matcher() -> KeywordMatcher:
+    """Build the matcher once per process from the knowledge base lexicons."""
+    industries, action_verbs = load_lexicons()
+    return KeywordMatcher(industries, action_verbs)
+
+
+# ─── Public API ──────────────────────────────────────────────────────────────
+
+def compute_keyword_facts(resume_text: str, detected_field: str = "") -> dict:
+    """
+    Compute keyword and action-verb facts for a resume.
+
+    Keyword hits and coverage are exact lexicon matches; density, action-verb
+    and quantified-line counts are heuristics.
+
+    Args:
+        resume_text: Extracted text from the PDF resume.
+        detected_field: Job field detected by the parse step, used to pick the industry lexicon.
+
+    Returns:
+        Dictionary of keyword hits, coverage, density and quantified-achievement counts.
+        Coverage and lexicon fields are empty when the field matches no industry lexicon.
+    """
+    matcher = get_matcher()
+    scan = matcher.scan(resume_text or "")
+    hits = scan["hits"]
+    industry = matcher.match_industry(detected_field)
+    industry_keywords = matcher.industries.get(industry, [])
+
+    found = [kw for kw in industry_keywords if kw.lower() in hits]
+    not_found = [kw for kw in industry_keywords if kw.lower() not in hits]
+    verbs = [matcher.patterns[p][1] for p in hits if matcher.patterns[p][0] == ACTION_VERB]
+
+    keyword_occurrences = sum(hits[kw.lower()] for kw in found)
+    word_count = scan["word_count"]
+    density = round(keyword_occurrences / word_count * 100, 2) if word_count else 0.0
+
+    coverage = round(len(found) / len(industry_keywords) * 100, 1) if industry_keywords else 0.0
+
+    return {
+        "matched_industry": industry or "Unknown",
+        "industry_keywords_found": found,
+        "lexicon_terms_not_found": not_found,
+        "keyword_coverage_percent": coverage,
+        "keyword_occurrences": keyword_occurrences,
+        "word_count": word_count,
+        "keyword_density_percent": density,
+        "action_verbs_used": verbs,
+        "action_verb_lines": scan["action_lines"],
+        "quantified_achievements": scan["quantified_achievements"],
+    }
+
+
+def format_verb_facts(facts: dict) -> str:
+    """Render the heuristic action-verb and quantified-line counts as a prompt block."""
+    return f"""Heuristic counts (use your judgment — lines led by a lexicon action verb; lines with a number other than a date, phone or URL):
+- Action verbs used: {facts.get("action_verbs_used", [])}
+- Lines led by an action verb: {facts.get("action_verb_lines", 0)}
+- Lines with a metric: {facts.get("quantified_achievements", 0)}"""
+
+
+def format_keyword_facts(facts: dict) -> str:
+    """Render keyword facts as a prompt block for the LLM."""
+    return f"""Exact lexicon matches:
+- Matched industry lexicon: {facts.get("matched_industry", "Unknown")}
+- Industry keywords found: {facts.get("industry_keywords_found", [])}
+- Keyword coverage: {facts.get("keyword_coverage_percent", 0)}%
+
+Heuristic density (matched-lexicon term occurrences per word; not a job-posting match, so judge stuffing yourself):
+- {facts.get("keyword_density_percent", 0)}% of {facts.get("word_count", 0)} words
+
+{format_verb_facts(facts)}
+
+Context only — lexicon terms not present (many may be irrelevant to this candidate):
+{facts.get("lexicon_terms_not_found", [])}"""
+
+
+def score_keyword_facts(facts: dict) -> dict:
+    """Score keyword optimization from local facts alone (fast mode, no LLM call)."""
+    coverage = facts.get("keyword_coverage_percent", 0)
+    found = facts.get("industry_keywords_found", [])
+    not_found = facts.get("lexicon_terms_not_found", [])
+    industry = facts.get("matched_industry", "Unknown")
+    has_lexicon = industry != "Unknown"
+
+    # Without a matching industry lexicon coverage is unknown, so score it neutrally
+    coverage_points = min(coverage, 50) if has_lexicon else 25
+    score = 35 + coverage_points + min(len(found), 15)
+
+    strengths, weaknesses, suggestions = [], [], []
+    if found:
+        strengths.append(f"Includes {len(found)} {industry} keywords: {', '.join(found[:8])}")
+    if not_found:
+        weaknesses.append(
+            f"{coverage}% of {industry} lexicon terms are present; "
+            f"not present: {', '.join(not_found[:10])}"
+        )
+        suggestions.append("Check the job posting and include the terms from it that match your experience")
+
+    return {
+        "score": round(min(score, 100)),
+        "strengths": strengths,
+        "weaknesses": weaknesses,
+        "suggestions": suggestions,
+        "details": facts,
+    }
+
+
+def score_experience_facts(facts: dict) -> dict:
+    """Score experience quality from local action-verb facts alone (fast mode, no LLM call)."""
+    verbs = facts.get("action_verbs_used", [])
+    action_lines = facts.get("action_verb_lines", 0)
+    quantified = facts.get("quantified_achievements", 0)
+
+    score = 40 + min(action_lines * 5, 30) + min(quantified * 10, 30)
+
+    strengths, weaknesses, suggestions = [], [], []
+    if verbs:
+        strengths.append(f"Uses strong action verbs: {', '.join(verbs[:8])}")
+    else:
+        weaknesses.append("No bullets starting with a strong action verb were detected")
+        suggestions.append("Start each experience bullet with an action verb such as Led, Developed or Improved")
+    if quantified:
+        strengths.append(f"{quantified} line(s) include metrics")
+    else:
+        weaknesses.append("No metrics were detected in the resume")
+        suggestions.append("Add metrics such as percentages, revenue, team size or time saved to your bullets")
+
+    return {
+        "score": round(min(score, 100)),
+        "strengths": strengths,
+        "weaknesses": weaknesses,
+        "suggestions": suggestions,
+        "details": {
+            "action_verbs_used": verbs,
+            "action_verb_lines": action_lines,
+            "quantified_achievements": quantified,
+        },
+    }
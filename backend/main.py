@@ -1,18 +1,20 @@
 """
 AI Resume Analyzer - FastAPI Backend
-Main entry point with file upload endpoint and health check.
+Main entry point with file upload endpoint, report retrieval and health check.
 """
 
 import os
+from collections import OrderedDict
 from dotenv import load_dotenv
 
 load_dotenv()
 
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from pdf_parser import extract_text_from_pdf, get_pdf_metadata
 from ats_graph import analyze_resume
+from response_utils import content_hash, encode_json, json_response
 
 app = FastAPI(
     title="AI Resume Analyzer",
@@ -27,18 +29,64 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# Completed reports kept in memory for re-fetching, keyed by content hash (oldest evicted first)
+MAX_CACHED_REPORTS = 256
+report_cache: OrderedDict = OrderedDict()
+
 
 class HealthResponse(BaseModel):
     status: str
     version: str
 
 
+class CategoryScore(BaseModel):
+    score: float
+    label: str
+    weight: str
+    strengths: list[str] = []
+    weaknesses: list[str] = []
+    suggestions: list[str] = []
+    details: dict = {}
+
+
+class Improvement(BaseModel):
+    priority: str = "medium"
+    category: str = ""
+    title: str = ""
+    description: str = ""
+
+
+class AnalysisReport(BaseModel):
+    overall_score: int
+    category_scores: dict[str, CategoryScore]
+    summary: str
+    top_improvements: list[Improvement] = []
+    ats_compatibility: str
+    estimated_pass_rate: str
+    detected_field: str
+
+
 class AnalysisResponse(BaseModel):
     success: bool
-    data: dict
+    data: AnalysisReport
     message: str
+    report_id: str
+
+
+def report_response(request: Request, report_id: str, report: AnalysisReport, conditional: bool = True):
+    """Serialize a report envelope with content negotiation and ETag support."""
+    envelope = AnalysisResponse(
+        success=True,
+        data=report,
+        message="Resume analysis completed successfully.",
+        report_id=report_id,
+    )
+    return json_response(
+        request, envelope.model_dump(mode="json"), digest=report_id, conditional=conditional
+    )
 
 
 @app.get("/api/health", response_model=HealthResponse)
@@ -48,12 +96,13 @@ async def health_check():
 
 
 @app.post("/api/analyze", response_model=AnalysisResponse)
-async def analyze_resume_endpoint(file: UploadFile = File(...)):
+async def analyze_resume_endpoint(request: Request, file: UploadFile = File(...)):
     """
     Upload a PDF resume and receive an ATS analysis report.
     
     - Accepts PDF files only (max 10MB)
     - Returns overall score, category breakdowns, and improvement suggestions
+    - Returns a report_id and ETag for re-fetching via GET /api/reports/{report_id}
     """
     # Validate file type
     if not file.filename or not file.filename.lower().endswith(".pdf"):
@@ -93,13 +142,17 @@ async def analyze_resume_endpoint(file: UploadFile = File(...)):
         metadata = get_pdf_metadata(file_bytes)
 
         # Run ATS analysis via LangGraph
-        report = await analyze_resume(resume_text, metadata)
+        report = AnalysisReport.model_validate(await analyze_resume(resume_text, metadata))
 
-        return AnalysisResponse(
-            success=True,
-            data=report,
-            message="Resume analysis completed successfully.",
-        )
+        # The report's content hash doubles as its id and the base of its ETag
+        report_id = content_hash(encode_json(report.model_dump(mode="json")))
+        report_cache[report_id] = report
+        report_cache.move_to_end(report_id)
+        while len(report_cache) > MAX_CACHED_REPORTS:
+            report_cache.popitem(last=False)
+
+        # POST is unsafe: never answer it with 304, only hand out the ETag for later GETs
+        return report_response(request, report_id, report, conditional=False)
 
     except HTTPException:
         raise
@@ -110,6 +163,21 @@ async def analyze_resume_endpoint(file: UploadFile = File(...)):
         )
 
 
+@app.get("/api/reports/{report_id}", response_model=AnalysisResponse)
+async def get_report(report_id: str, request: Request):
+    """
+    Re-fetch a previously generated report.
+
+    - Send If-None-Match with the report's ETag to get 304 Not Modified
+    - Responses are gzip/brotli compressed according to Accept-Encoding
+    """
+    report = report_cache.get(report_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Report not found.")
+
+    return report_response(request, report_id, report)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
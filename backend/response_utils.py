@@ -0,0 +1,142 @@
+"""
+Response Utilities Module
+Fast JSON encoding, per-request gzip/brotli negotiation and ETag handling for API responses.
+"""
+
+import gzip
+import hashlib
+
+import brotli
+import orjson
+from fastapi import Request, Response
+
+# Payloads smaller than this are sent uncompressed — the framing overhead outweighs the savings
+MIN_COMPRESS_SIZE = 500
+
+# Preferred first when the client rates encodings equally
+SUPPORTED_ENCODINGS = ("br", "gzip")
+
+
+def encode_json(content) -> bytes:
+    """Serialize content to compact JSON bytes with orjson."""
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS)
+
+
+def content_hash(body: bytes) -> str:
+    """SHA-256 hex digest of the serialized content."""
+    return hashlib.sha256(body).hexdigest()
+
+
+def representation_etag(digest: str, encoding: str | None) -> str:
+    """
+    Strong ETag for one representation of the content.
+
+    RFC 9110 requires strong validators to differ per content-coding, so the
+    coding is appended to the content hash ("<hash>-br", "<hash>-gzip").
+    """
+    return f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+
+
+def _etag_digest(tag: str) -> str:
+    """Strip the weak prefix, quotes and any content-coding suffix from an entity tag."""
+    tag = tag.strip().removeprefix("W/").strip('"')
+    for coding in SUPPORTED_ENCODINGS:
+        tag = tag.removesuffix(f"-{coding}")
+    return tag
+
+
+def etag_matches(if_none_match: str, digest: str) -> bool:
+    """
+    Check an If-None-Match header against a content hash.
+
+    Uses weak comparison (per RFC 9110) so a tag received for any
+    content-coding of the same content still matches.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(_etag_digest(tag) == digest for tag in if_none_match.split(","))
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """
+    Pick the best supported content-coding from an Accept-Encoding header.
+
+    Returns:
+        "br", "gzip", or None for an uncompressed (identity) response.
+    """
+    qualities = {}
+    for item in (accept_encoding or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[coding] = quality
+
+    best, best_quality = None, 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str | None) -> bytes:
+    """Compress a response body with the negotiated content-coding."""
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    return body
+
+
+def json_response(
+    request: Request,
+    content,
+    digest: str | None = None,
+    conditional: bool = True,
+    status_code: int = 200,
+) -> Response:
+    """
+    Build a JSON response, honouring Accept-Encoding and, optionally, If-None-Match.
+
+    Args:
+        request: Incoming request, used for conditional and encoding headers.
+        content: JSON-serializable content for the body.
+        digest: Optional content hash; sent as a per-coding ETag.
+        conditional: Return 304 when If-None-Match matches the digest. Only
+            safe methods should enable this.
+        status_code: Status code for a full response.
+
+    Returns:
+        A 304 Not Modified or a (possibly compressed) JSON response.
+    """
+    body = encode_json(content)
+    encoding = None
+    if len(body) >= MIN_COMPRESS_SIZE:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+
+    headers = {"Vary": "Accept-Encoding"}
+    if digest:
+        headers["ETag"] = representation_etag(digest, encoding)
+        if conditional and etag_matches(request.headers.get("if-none-match", ""), digest):
+            return Response(status_code=304, headers=headers)
+
+    if encoding:
+        body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers,
+    )
@@ -0,0 +1,112 @@
+"""
+Tests for the local keyword and action-verb matcher.
+"""
+
+from keyword_matcher import KeywordMatcher, compute_keyword_facts, get_matcher
+
+
+def make_matcher(keywords, verbs=()):
+    return KeywordMatcher({"Test": list(keywords)}, list(verbs))
+
+
+def test_whole_term_boundaries():
+    matcher = make_matcher(["Git", "SQL", "Java"])
+    hits = matcher.scan("GitHub, NoSQL and JavaScript, but also Git and SQL.")["hits"]
+    assert hits == {"git": 1, "sql": 1}
+
+
+def test_overlapping_patterns():
+    matcher = make_matcher(["machine learning", "learning", "deep learning"])
+    hits = matcher.scan("Deep learning and machine learning")["hits"]
+    assert hits == {"deep learning": 1, "machine learning": 1, "learning": 2}
+
+
+def test_punctuated_terms():
+    matcher = make_matcher(["C++", "CI/CD", "Node.js"])
+    hits = matcher.scan("Built CI/CD for C++ and Node.js services")["hits"]
+    assert hits == {"c++": 1, "ci/cd": 1, "node.js": 1}
+
+
+def test_case_sensitive_terms():
+    hits = get_matcher().scan("Ready to go with Go and rust-free tooling")["hits"]
+    assert hits.get("go") == 1
+    assert "rust" not in hits
+
+
+def test_case_sensitive_terms_reject_lowercase_words():
+    matcher = get_matcher()
+    assert "express" not in matcher.scan("Shipped via express delivery")["hits"]
+    assert matcher.scan("APIs in Express and Rust")["hits"] == {"express": 1, "rust": 1}
+    assert "rust" not in matcher.scan("Removed rust from the hull")["hits"]
+
+
+def test_action_verbs_must_lead_the_line():
+    matcher = make_matcher([], ["Led", "Managed", "Designed"])
+    scan = matcher.scan("• Led the migration\nThe team I managed\n3. Managed releases\nWork I designed")
+    assert scan["hits"] == {"led": 1, "managed": 1}
+    assert scan["action_lines"] == 2
+
+
+def test_united_is_not_an_action_verb():
+    facts = compute_keyword_facts("United Airlines, 2018 - 2020\nLed a team of 6", "Software Engineering")
+    assert facts["action_verbs_used"] == ["Led"]
+
+
+def test_quantified_lines_ignore_dates():
+    matcher = make_matcher([], ["Managed", "Improved", "Led"])
+    scan = matcher.scan(
+        "Managed 2019 budget\n"
+        "Led migration, 06/2020 - 2021\n"
+        "Improved throughput by 35%\n"
+        "Engineer at Acme with 12 reports"
+    )
+    assert scan["action_lines"] == 3
+    assert scan["quantified_achievements"] == 2
+
+
+def test_quantified_lines_do_not_need_a_lexicon_verb():
+    matcher = make_matcher([], ["Led"])
+    scan = matcher.scan(
+        "• Reduced churn by 25%\n"
+        "Increased conversion by 18%\n"
+        "Cut cloud spend by 30%\n"
+        "Phone: +1 (555) 123-4567, jane@example.com\n"
+        "Reduced manual work"
+    )
+    assert scan["action_lines"] == 0
+    assert scan["quantified_achievements"] == 3
+
+
+def test_unmatched_field_has_no_lexicon():
+    facts = compute_keyword_facts("Patient care and Python scripting", "Culinary Arts")
+    assert facts["matched_industry"] == "Unknown"
+    assert facts["industry_keywords_found"] == []
+    assert facts["lexicon_terms_not_found"] == []
+    assert facts["keyword_coverage_percent"] == 0.0
+
+
+def test_field_matches_industry_by_stem():
+    facts = compute_keyword_facts("Financial modeling and forecasting", "Financial Analyst")
+    assert facts["matched_industry"] == "Finance"
+    assert facts["industry_keywords_found"] == ["Financial modeling", "forecasting"]
+
+
+def test_generic_field_words_do_not_win_ties():
+    matcher = get_matcher()
+    assert matcher.match_industry("Marketing Manager") == "Marketing / Digital"
+    assert matcher.match_industry("Healthcare Manager") == "Healthcare"
+    assert matcher.match_industry("Operations Manager") == "Business / Management"
+
+
+def test_field_aliases():
+    matcher = get_matcher()
+    for field in ("Full Stack Developer", "Web Development", "Data Scientist"):
+        assert matcher.match_industry(field) == "Technology / Software Engineering"
+    assert matcher.match_industry("Registered Nurse") == "Healthcare"
+    assert matcher.match_industry("Unknown") is None
+
+
+def test_density_counts_only_the_matched_industry():
+    facts = compute_keyword_facts("Python and SEO and budgeting work", "Software Engineering")
+    assert facts["keyword_occurrences"] == 1
+    assert facts["keyword_density_percent"] == round(1 / 6 * 100, 2)
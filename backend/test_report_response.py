@@ -0,0 +1,150 @@
+"""
+Tests for report normalisation, typed serialization, content negotiation and conditional responses.
+"""
+
+import json
+from types import SimpleNamespace
+
+from fastapi import Request
+from fastapi.testclient import TestClient
+
+import ats_graph
+import main
+from response_utils import MIN_COMPRESS_SIZE, etag_matches, json_response, negotiate_encoding
+
+MALFORMED_SUMMARY = {
+    "summary": None,
+    "top_improvements": ["Add metrics", {"priority": None, "title": "Use a summary", "description": 3}, 42],
+    "ats_compatibility": None,
+    "estimated_pass_rate": 75,
+}
+
+MALFORMED_STATE = {
+    "parsed_sections": {"detected_job_field": None},
+    "formatting_score": {"score": "85", "strengths": "Clean layout", "weaknesses": [{"issue": "Tables", "fix": "Remove"}]},
+    "keyword_score": {"error": "Failed to parse LLM response", "raw": ""},
+    "experience_score": [],
+    "skills_score": {"score": None, "suggestions": [None, "Group skills"], "details": "n/a"},
+}
+
+
+class FakeLLM:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def invoke(self, prompt):
+        return SimpleNamespace(content=json.dumps(self.payload))
+
+
+def make_report():
+    cats = {
+        key: {"score": 80, "label": key, "weight": "20%", "strengths": ["x" * 200] * 3}
+        for key in ("formatting", "keywords", "experience", "skills")
+    }
+    return {
+        "overall_score": 80,
+        "category_scores": cats,
+        "summary": "ok",
+        "top_improvements": [],
+        "ats_compatibility": "good",
+        "estimated_pass_rate": "75%",
+        "detected_field": "Software",
+    }
+
+
+def test_malformed_llm_output_yields_valid_report(monkeypatch):
+    monkeypatch.setattr(ats_graph, "get_llm", lambda: FakeLLM(MALFORMED_SUMMARY))
+    report = ats_graph.generate_final_report(MALFORMED_STATE)["final_report"]
+
+    parsed = main.AnalysisReport.model_validate(report)
+    assert parsed.detected_field == "Unknown"
+    assert parsed.ats_compatibility == "fair"
+    assert parsed.estimated_pass_rate == "75"
+    assert [i.title for i in parsed.top_improvements] == ["Add metrics", "Use a summary"]
+    assert parsed.top_improvements[1].priority == "medium"
+    formatting = parsed.category_scores["formatting"]
+    assert formatting.score == 85
+    assert formatting.strengths == ["Clean layout"]
+    assert formatting.weaknesses == ["Tables — Remove"]
+    assert parsed.category_scores["skills"].suggestions == ["Group skills"]
+
+
+def post_resume(client, monkeypatch, headers=None):
+    async def fake_analyze(text, metadata):
+        return make_report()
+
+    monkeypatch.setenv("GROQ_API_KEY", "test")
+    monkeypatch.setattr(main, "extract_text_from_pdf", lambda b: "x" * 100)
+    monkeypatch.setattr(main, "get_pdf_metadata", lambda b: {})
+    monkeypatch.setattr(main, "analyze_resume", fake_analyze)
+    return client.post(
+        "/api/analyze",
+        files={"file": ("cv.pdf", b"%PDF", "application/pdf")},
+        headers=headers or {},
+    )
+
+
+def test_etag_differs_per_content_coding(monkeypatch):
+    client = TestClient(main.app)
+    report_id = post_resume(client, monkeypatch).json()["report_id"]
+
+    tags = {
+        coding: client.get(f"/api/reports/{report_id}", headers={"Accept-Encoding": coding}).headers["etag"]
+        for coding in ("br", "gzip", "identity")
+    }
+    assert tags == {
+        "br": f'"{report_id}-br"',
+        "gzip": f'"{report_id}-gzip"',
+        "identity": f'"{report_id}"',
+    }
+
+    revalidated = client.get(
+        f"/api/reports/{report_id}",
+        headers={"Accept-Encoding": "identity", "If-None-Match": tags["br"]},
+    )
+    assert revalidated.status_code == 304
+
+
+def test_post_ignores_if_none_match(monkeypatch):
+    client = TestClient(main.app)
+    first = post_resume(client, monkeypatch)
+    second = post_resume(client, monkeypatch, headers={"If-None-Match": first.headers["etag"]})
+
+    assert second.status_code == 200
+    assert second.json()["report_id"] == first.json()["report_id"]
+
+
+def make_request(**headers):
+    return Request({
+        "type": "http",
+        "headers": [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()],
+    })
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("gzip, br") == "br"
+    assert negotiate_encoding("br;q=0.5, gzip;q=0.8") == "gzip"
+    assert negotiate_encoding("gzip, br;q=0") == "gzip"
+    assert negotiate_encoding("*") == "br"
+    assert negotiate_encoding("*;q=0, gzip") == "gzip"
+    assert negotiate_encoding("deflate, identity") is None
+    assert negotiate_encoding("") is None
+
+
+def test_etag_matches():
+    assert etag_matches("*", "abc")
+    assert etag_matches('"abc"', "abc")
+    assert etag_matches('W/"abc-gzip"', "abc")
+    assert etag_matches('"other", "abc-br"', "abc")
+    assert not etag_matches('"abcd"', "abc")
+    assert not etag_matches("", "abc")
+
+
+def test_small_payloads_are_not_compressed():
+    small = json_response(make_request(accept_encoding="br"), {"ok": True}, digest="abc")
+    assert "content-encoding" not in small.headers
+    assert small.headers["etag"] == '"abc"'
+
+    large = json_response(make_request(accept_encoding="br"), {"x": "y" * MIN_COMPRESS_SIZE}, digest="abc")
+    assert large.headers["content-encoding"] == "br"
+    assert large.headers["etag"] == '"abc-br"'